@@ -11,23 +11,36 @@ continuous monitoring of pump speeds, fan RPMs, and water temperature.
 
 import argparse
 import logging
+import threading
 import time
-from typing import Dict, Optional, Tuple
+from typing import Dict, Iterator
 
-from prometheus_client import start_http_server, Gauge, CollectorRegistry
+from prometheus_client import start_http_server, CollectorRegistry
+from prometheus_client.core import GaugeMetricFamily, Metric
+from prometheus_client.registry import Collector
 from icue_link_telemetry import CorsairLinkDevice, CorsairLinkError
 
 # Create a custom registry to hold our metrics. This is a more robust
 # way to disable default metrics across different library versions.
 custom_registry = CollectorRegistry()
 
-# Prometheus metric definitions registered with our custom registry
-PUMP_RPM = Gauge('icue_link_pump_rpm', 'Pump speed in RPM', registry=custom_registry)
-WATER_TEMP = Gauge('icue_link_water_temp', 'Water temperature in Celsius', registry=custom_registry)
-FAN_RPM = Gauge('icue_link_fan_rpm', 'Fan speed in RPM', ['fan_id'], registry=custom_registry)
+# Reconnect back-off bounds (in seconds)
+RECONNECT_DELAY_INITIAL = 1.0
+RECONNECT_DELAY_MAX = 60.0
 
-class ICueLinkExporter:
-    """Prometheus exporter for iCUE LINK System Hub telemetry."""
+# Consecutive readings without any data before the device is reopened
+MAX_EMPTY_READINGS = 3
+
+class ICueLinkExporter(Collector):
+    """
+    Prometheus exporter for iCUE LINK System Hub telemetry.
+    
+    The main thread polls the device every update interval and publishes
+    the latest reading as a snapshot; scrapes, served from the HTTP
+    server's own thread, only copy that snapshot and never wait on device
+    I/O. If the device fails, the last-known values are kept and
+    reconnects are attempted with exponential back-off.
+    """
     
     def __init__(self, port: int = 8000, update_interval: float = 5.0):
         """
@@ -35,11 +48,23 @@ class ICueLinkExporter:
         
         Args:
             port: HTTP port to expose metrics on
-            update_interval: How often to update metrics (in seconds)
+            update_interval: How often to read the device (in seconds)
         """
         self.port = port
         self.update_interval = update_interval
-        self.device: Optional[CorsairLinkDevice] = None
+        # One instance for the whole run, so its tuned command delay
+        # survives reconnects
+        self.device = CorsairLinkDevice()
+        self._reconnect_delay = RECONNECT_DELAY_INITIAL
+        self._next_connect = float('-inf')
+        self._empty_readings = 0
+        self._n_fans = 0  # Highest fan number that has reported so far
+        
+        # Latest reading, replaced by the poll loop and copied by collect()
+        self._lock = threading.Lock()
+        self._snapshot: Dict[str, object] = {
+            'temp': 0, 'pump': 0, 'fans': [], 'fan_labels': (), 'ts': time.monotonic()
+        }
         self._setup_logging()
     
     def _setup_logging(self) -> None:
@@ -51,43 +76,115 @@ class ICueLinkExporter:
         self.logger = logging.getLogger(__name__)
     
     def _update_metrics(self) -> None:
-        """Read telemetry data and update Prometheus metrics."""
+        """Read telemetry data and publish it as the current snapshot."""
         try:
-            if not self.device:
-                self.device = CorsairLinkDevice()
+            if not self.device.connected:
+                if time.monotonic() < self._next_connect:
+                    return  # Still backing off from the last failure
+                
                 self.device.connect()
                 self.device.enter_software_mode()
             
-            # Read temperature
-            temp = self.device.read_temperature()
+            # Read temperature and speeds
+            temp, pump_rpm, fan_rpms = self.device.read_all(max_fans=None)
+            
+            # read_all reports failures as missing values; if nothing comes
+            # back for a while, treat the device as gone and reopen it
+            if temp is None and pump_rpm is None and all(rpm is None for rpm in fan_rpms):
+                self._empty_readings += 1
+                if self._empty_readings >= MAX_EMPTY_READINGS:
+                    raise CorsairLinkError(
+                        f"No telemetry in {self._empty_readings} consecutive readings"
+                    )
+                return
+            
+            self._empty_readings = 0
+            self._reconnect_delay = RECONNECT_DELAY_INITIAL
+            
+            with self._lock:
+                snapshot = dict(self._snapshot)
+            snapshot['ts'] = time.monotonic()
+            
             if temp is not None:
-                WATER_TEMP.set(temp)
+                snapshot['temp'] = temp
             
-            # Read speeds
-            pump_rpm, fan_rpms = self.device.read_speeds()
             if pump_rpm is not None:
-                PUMP_RPM.set(pump_rpm)
+                snapshot['pump'] = pump_rpm
+            
+            # Only export series up to the highest fan that has reported;
+            # grow when a later fan appears, never shrink, so series stay stable
+            n_fans = max(
+                (i for i, rpm in enumerate(fan_rpms, 1) if rpm is not None), default=0
+            )
+            if n_fans > self._n_fans:
+                # Label values are resolved once per fan, not on every scrape
+                snapshot['fan_labels'] = snapshot['fan_labels'] + tuple(
+                    (str(i),) for i in range(self._n_fans + 1, n_fans + 1)
+                )
+                snapshot['fans'] = snapshot['fans'] + [0] * (n_fans - self._n_fans)
+                self._n_fans = n_fans
+                self.logger.info(f"Discovered {self._n_fans} fan(s)")
             
             # Update fan metrics
-            for i, rpm in enumerate(fan_rpms, 1):
+            fans = list(snapshot['fans'])
+            for i, rpm in enumerate(fan_rpms[:self._n_fans]):
                 if rpm is not None:
-                    FAN_RPM.labels(fan_id=str(i)).set(rpm)
+                    fans[i] = rpm
+            snapshot['fans'] = fans
+            
+            with self._lock:
+                self._snapshot = snapshot
             
         except CorsairLinkError as e:
-            self.logger.error(f"Error reading telemetry: {e}")
-            # Reset metrics to indicate no data
-            WATER_TEMP.set(0)
-            PUMP_RPM.set(0)
-            for i in range(1, 4):  # Reset all fan metrics
-                FAN_RPM.labels(fan_id=str(i)).set(0)
+            self.logger.error(
+                f"Error reading telemetry: {e} (retrying in {self._reconnect_delay:.0f}s)"
+            )
+            # Keep the last-known values; the age metric shows they are stale
             
-            # Try to recover connection
-            if self.device:
+            # Try to recover connection after a back-off delay
+            if self.device.connected:
                 try:
                     self.device.disconnect()
                 except:
                     pass
-                self.device = None
+            
+            self._empty_readings = 0
+            self._next_connect = time.monotonic() + self._reconnect_delay
+            self._reconnect_delay = min(self._reconnect_delay * 2, RECONNECT_DELAY_MAX)
+    
+    def _poll_device(self) -> None:
+        """Refresh the snapshot every update interval, waiting out any reconnect back-off."""
+        while True:
+            try:
+                self._update_metrics()
+            except Exception:
+                # Keep polling; the age metric shows the values are stale
+                self.logger.exception("Unexpected error while polling device")
+            
+            delay = self.update_interval
+            if not self.device.connected:
+                delay = max(delay, self._next_connect - time.monotonic())
+            time.sleep(delay)
+    
+    def collect(self) -> Iterator[Metric]:
+        """Yield metrics from the latest snapshot."""
+        with self._lock:
+            snap = dict(self._snapshot)
+        age = time.monotonic() - snap['ts']
+        
+        yield GaugeMetricFamily('icue_link_pump_rpm', 'Pump speed in RPM', value=snap['pump'])
+        yield GaugeMetricFamily('icue_link_water_temp', 'Water temperature in Celsius', value=snap['temp'])
+        
+        fans = GaugeMetricFamily('icue_link_fan_rpm', 'Fan speed in RPM', labels=['fan_id'])
+        for labels, rpm in zip(snap['fan_labels'], snap['fans']):
+            fans.add_metric(labels, rpm)
+        yield fans
+        
+        yield GaugeMetricFamily(
+            'icue_link_last_update_age_seconds',
+            'Seconds since telemetry was last read successfully',
+            value=age
+        )
     
     def run(self) -> None:
         """Run the exporter service."""
@@ -95,11 +192,10 @@ class ICueLinkExporter:
         self.logger.info(f"Updating metrics every {self.update_interval} seconds")
         
         # Start HTTP server with our custom registry to avoid default metrics
+        custom_registry.register(self)
         start_http_server(self.port, registry=custom_registry)
         
-        while True:
-            self._update_metrics()
-            time.sleep(self.update_interval)
+        self._poll_device()
 
 def create_argument_parser() -> argparse.ArgumentParser:
     """Create command line argument parser."""
@@ -145,7 +241,7 @@ def main() -> None:
     except KeyboardInterrupt:
         logging.info("Exiting...")
     finally:
-        if exporter.device:
+        if exporter.device.connected:
             exporter.device.disconnect()
 
 if __name__ == '__main__':
@@ -19,12 +19,13 @@ License: MIT
 
 import argparse
 import csv
+import functools
 import logging
+import signal
 import struct
 import sys
 import time
-from datetime import datetime
-from typing import List, Optional, Tuple
+from typing import Dict, List, Optional, Set, Tuple
 
 try:
     import hid
@@ -61,6 +62,10 @@ ENDPOINT_TEMPS = bytes([0x21])
 DATA_TYPE_SPEEDS = bytes([0x25, 0x00])
 DATA_TYPE_TEMPS = bytes([0x10, 0x00])
 
+# Data type identifiers as little-endian integers, for cheap comparison
+_DATA_TYPE_SPEEDS_INT = int.from_bytes(DATA_TYPE_SPEEDS, 'little')
+_DATA_TYPE_TEMPS_INT = int.from_bytes(DATA_TYPE_TEMPS, 'little')
+
 # Response Parsing Constants
 STATUS_CODE_INDEX = 1
 DATA_TYPE_START_INDEX = 4
@@ -71,16 +76,49 @@ TEMP_SCALING_FACTOR = 10.0
 TEMP_VALUE_INDEX_LOW = 11
 TEMP_VALUE_INDEX_HIGH = 12
 
+# Precompiled parser for 16-bit little-endian signed values
+_S16 = struct.Struct('<h')
+
+# Precompiled parser for a speed sensor block: status byte + 16-bit RPM
+_SENSOR = struct.Struct('<Bh')
+
 # Speed Sensor Constants
 SENSOR_BLOCK_SIZE = 3
 PUMP_SENSOR_INDEX = 1
 FAN_SENSORS_START_INDEX = 13
 MAX_FANS = 3
+MAX_SENSORS = (INPUT_REPORT_SIZE - PAYLOAD_START_INDEX - 1) // SENSOR_BLOCK_SIZE
 
 # Communication Timing
-COMMAND_DELAY_SECONDS = 0.05
+COMMAND_DELAY_SECONDS = 0.05  # Validated delay from the protocol spec; starting and maximum delay
+MIN_COMMAND_DELAY_SECONDS = 0.001  # Not measured on hardware; the delay only probes down to it
+DELAY_SHRINK_SUCCESSES = 8  # Prompt responses in a row before the delay is halved
 RESPONSE_TIMEOUT_SECONDS = 1.0
 
+# Pre-framed (header + command + data) byte strings for the fixed command set
+FRAMED_ENTER = CMD_HEADER + CMD_ENTER_SOFTWARE_MODE
+FRAMED_EXIT = CMD_HEADER + CMD_EXIT_SOFTWARE_MODE
+FRAMED_READ = CMD_HEADER + CMD_READ
+FRAMED_OPEN_SPEEDS = CMD_HEADER + CMD_OPEN_ENDPOINT + ENDPOINT_SPEEDS
+FRAMED_CLOSE_SPEEDS = CMD_HEADER + CMD_CLOSE_ENDPOINT + ENDPOINT_SPEEDS
+FRAMED_OPEN_TEMPS = CMD_HEADER + CMD_OPEN_ENDPOINT + ENDPOINT_TEMPS
+FRAMED_CLOSE_TEMPS = CMD_HEADER + CMD_CLOSE_ENDPOINT + ENDPOINT_TEMPS
+
+# Fixed (command, data) pairs sent during normal operation
+FIXED_COMMANDS = {
+    (CMD_ENTER_SOFTWARE_MODE, b''): FRAMED_ENTER,
+    (CMD_EXIT_SOFTWARE_MODE, b''): FRAMED_EXIT,
+    (CMD_READ, b''): FRAMED_READ,
+    (CMD_OPEN_ENDPOINT, ENDPOINT_SPEEDS): FRAMED_OPEN_SPEEDS,
+    (CMD_CLOSE_ENDPOINT, ENDPOINT_SPEEDS): FRAMED_CLOSE_SPEEDS,
+    (CMD_OPEN_ENDPOINT, ENDPOINT_TEMPS): FRAMED_OPEN_TEMPS,
+    (CMD_CLOSE_ENDPOINT, ENDPOINT_TEMPS): FRAMED_CLOSE_TEMPS,
+}
+
+# CSV Logging
+CSV_BUFFER_SIZE = 1 << 16
+CSV_FLUSH_INTERVAL_SECONDS = 10.0
+
 # Status Codes
 STATUS_SUCCESS = 0x00
 
@@ -90,6 +128,17 @@ class CorsairLinkError(Exception):
     pass
 
 
+class _LazyHex:
+    """Hex dump of the start of a packet, formatted only when logged."""
+    
+    def __init__(self, data, length: int = 32):
+        self.data = data
+        self.length = length
+    
+    def __str__(self) -> str:
+        return ' '.join(f'{b:02X}' for b in self.data[:self.length])
+
+
 class CorsairLinkDevice:
     """
     Handles communication with a Corsair iCUE LINK System Hub.
@@ -98,16 +147,31 @@ class CorsairLinkDevice:
     for reading telemetry from Corsair cooling devices.
     """
     
-    def __init__(self, debug: bool = False):
+    def __init__(self, debug: bool = False, command_delay: float = COMMAND_DELAY_SECONDS):
         """
         Initialize the device handler.
         
         Args:
             debug: Enable debug logging for protocol communication
+            command_delay: Starting and maximum delay (in seconds) to wait
+                after each command before sending the next one
         """
         self.device: Optional[hid.device] = None
         self.device_path: Optional[str] = None
         self.debug = debug
+        self.command_delay = command_delay
+        # Start from the validated delay and only shorten it once the device
+        # keeps up; the floor is raised above any delay that timed out
+        self._adaptive_delay = command_delay
+        self._delay_floor = min(MIN_COMMAND_DELAY_SECONDS, command_delay)
+        self._prompt_streak = 0
+        self._tx_buf = bytearray(OUTPUT_REPORT_SIZE)  # Report ID stays 0x00
+        self._tx_len = 0
+        self._packet_cache: Dict[Tuple[bytes, bytes], bytes] = {
+            key: bytes(self._create_command_packet(framed))
+            for key, framed in FIXED_COMMANDS.items()
+        }
+        self._open_endpoints: Set[bytes] = set()
         self._setup_logging()
     
     def _setup_logging(self) -> None:
@@ -119,6 +183,11 @@ class CorsairLinkDevice:
             )
         self.logger = logging.getLogger(__name__)
     
+    @property
+    def connected(self) -> bool:
+        """Whether the device is currently open."""
+        return self.device is not None
+    
     def connect(self) -> None:
         """
         Discover and connect to the iCUE LINK System Hub.
@@ -142,9 +211,12 @@ class CorsairLinkDevice:
         try:
             self.device = hid.device()
             self.device.open_path(device_info['path'])
-            self.device.set_nonblocking(1)  # Enable non-blocking reads for timeouts
+            # Hub state is unknown at connect time (an earlier session may have
+            # stopped mid-sequence), so the first read of each endpoint closes it
+            self._open_endpoints = {ENDPOINT_TEMPS, ENDPOINT_SPEEDS}
             self.logger.info("Successfully connected to device")
         except Exception as e:
+            self.device = None
             raise CorsairLinkError(f"Failed to connect to device: {e}")
     
     def disconnect(self) -> None:
@@ -169,29 +241,38 @@ class CorsairLinkDevice:
         """Context manager exit."""
         self.disconnect()
     
-    def _create_command_packet(self, command: bytes, data: bytes = b'') -> bytes:
+    def _create_command_packet(self, framed: bytes) -> bytearray:
         """
-        Create a properly formatted command packet.
+        Create a properly formatted command packet in the transmit buffer.
+        
+        The same buffer is reused for every packet, so the result is only
+        valid until the next call; copy it to keep it.
         
         Args:
-            command: The command bytes to send
-            data: Optional data payload
+            framed: Header, command and data bytes, already concatenated
             
         Returns:
             Formatted packet ready for transmission
         """
-        packet = bytearray(OUTPUT_REPORT_SIZE)
-        packet[0] = 0x00  # Report ID
+        packet = self._tx_buf
+        length = len(framed)
+        
+        # Clear whatever is left of a longer previous command
+        if self._tx_len > length:
+            packet[1 + length:1 + self._tx_len] = bytes(self._tx_len - length)
         
-        full_command = CMD_HEADER + command + data
-        packet[1:1 + len(full_command)] = full_command
+        packet[1:1 + length] = framed
+        self._tx_len = length
         
-        return bytes(packet)
+        return packet
     
     def _send_command(self, command: bytes, data: bytes = b'') -> None:
         """
         Send a command to the device.
         
+        Not thread-safe: commands outside the fixed set are built in the
+        shared transmit buffer. The device is only driven from one thread.
+        
         Args:
             command: Command bytes to send
             data: Optional data payload
@@ -202,26 +283,29 @@ class CorsairLinkDevice:
         if not self.device:
             raise CorsairLinkError("Device not connected")
         
-        packet = self._create_command_packet(command, data)
+        packet = self._packet_cache.get((command, data))
+        if packet is None:
+            packet = self._create_command_packet(CMD_HEADER + command + data)
         
         if self.debug:
-            self.logger.debug(f"Sending command: {command.hex()}, data: {data.hex()}")
+            self.logger.debug("Sending command: %s, data: %s", command.hex(), data.hex())
         
         try:
             self.device.write(packet)
-            time.sleep(COMMAND_DELAY_SECONDS)  # Critical timing delay
+            time.sleep(self._adaptive_delay)  # Let the device process the command
         except Exception as e:
             raise CorsairLinkError(f"Failed to send command: {e}")
     
-    def _read_response(self, expected_data_type: bytes) -> bytes:
+    def _read_response(self, expected_data_type: int) -> memoryview:
         """
         Read a response packet with the expected data type.
         
         Args:
-            expected_data_type: The 2-byte data type identifier to wait for
+            expected_data_type: The data type identifier to wait for, as a
+                little-endian integer
             
         Returns:
-            The response packet data
+            The response packet data, as a view over the received report
             
         Raises:
             CorsairLinkError: If timeout occurs or invalid response received
@@ -229,18 +313,23 @@ class CorsairLinkDevice:
         if not self.device:
             raise CorsairLinkError("Device not connected")
         
-        start_time = time.monotonic()
+        start = time.monotonic()
+        deadline = start + RESPONSE_TIMEOUT_SECONDS
         
-        while time.monotonic() - start_time < RESPONSE_TIMEOUT_SECONDS:
+        while True:
+            remaining_ms = int((deadline - time.monotonic()) * 1000)
+            if remaining_ms <= 0:
+                break
+            
             try:
-                response = self.device.read(INPUT_REPORT_SIZE)
+                # Blocks until a report arrives or the remaining budget expires
+                response = self.device.read(INPUT_REPORT_SIZE, remaining_ms)
                 
                 if not response:
-                    continue
+                    break
                 
                 if self.debug:
-                    hex_data = ' '.join(f'{b:02X}' for b in response[:32])
-                    self.logger.debug(f"Received: {hex_data}...")
+                    self.logger.debug("Received: %s...", _LazyHex(response))
                 
                 # Validate response structure
                 if len(response) < DATA_TYPE_START_INDEX + 2:
@@ -252,17 +341,62 @@ class CorsairLinkDevice:
                     raise CorsairLinkError(f"Device returned error status: 0x{status_code:02X}")
                 
                 # Check data type
-                received_type = bytes(response[DATA_TYPE_START_INDEX:DATA_TYPE_START_INDEX + 2])
+                received_type = (response[DATA_TYPE_START_INDEX]
+                                 | (response[DATA_TYPE_START_INDEX + 1] << 8))
                 if received_type == expected_data_type:
-                    return bytes(response)
+                    # Parsers rely on a full report, so check the length once here
+                    if len(response) < INPUT_REPORT_SIZE:
+                        raise CorsairLinkError(
+                            f"Short response: {len(response)} bytes, "
+                            f"expected {INPUT_REPORT_SIZE}"
+                        )
                     
+                    # A reply that still had to be waited for means the
+                    # device was not ready when the delay ran out
+                    self._adjust_delay(False, time.monotonic() - start > self._adaptive_delay)
+                    return memoryview(bytearray(response))
+                    
+            except CorsairLinkError:
+                raise
             except Exception as e:
-                if "Device returned error status" in str(e):
-                    raise
-                # Continue on read errors (device may not be ready)
-                continue
+                # hidapi only raises here if the device is gone or unusable
+                raise CorsairLinkError(f"Failed to read response: {e}")
+        
+        self._adjust_delay(True)
+        raise CorsairLinkError(
+            f"Timeout waiting for response type {expected_data_type.to_bytes(2, 'little').hex()}"
+        )
+    
+    def _adjust_delay(self, missed: bool, slow: bool = False) -> None:
+        """
+        Tune the delay used between commands.
+        
+        A timeout doubles the delay (up to command_delay) and never lets it
+        shrink back to the value that timed out. The delay is halved only
+        after DELAY_SHRINK_SUCCESSES prompt responses in a row, so it
+        settles instead of oscillating. The learned delay is kept across
+        reconnects.
+        
+        Args:
+            missed: True if the response timed out
+            slow: True if the response arrived later than the current delay
+        """
+        if missed:
+            self._delay_floor = min(self._adaptive_delay * 2, self.command_delay)
+            self._adaptive_delay = self._delay_floor
+            self._prompt_streak = 0
+        elif slow:
+            self._prompt_streak = 0
+            return
+        else:
+            self._prompt_streak += 1
+            if self._prompt_streak < DELAY_SHRINK_SUCCESSES:
+                return
+            self._prompt_streak = 0
+            self._adaptive_delay = max(self._adaptive_delay / 2, self._delay_floor)
         
-        raise CorsairLinkError(f"Timeout waiting for response type {expected_data_type.hex()}")
+        if self.debug:
+            self.logger.debug("Command delay: %.1f ms", self._adaptive_delay * 1000)
     
     def enter_software_mode(self) -> None:
         """
@@ -274,26 +408,52 @@ class CorsairLinkDevice:
         self.logger.info("Entering software mode")
         self._send_command(CMD_ENTER_SOFTWARE_MODE)
     
-    def _read_endpoint_data(self, endpoint: bytes, data_type: bytes) -> bytes:
+    def _read_endpoint_data(self, endpoint: bytes, data_type: int) -> memoryview:
         """
         Read data from a specific endpoint using the standard protocol sequence.
         
+        The leading close is only sent if the endpoint may have been left
+        open, e.g. by an earlier sequence that failed part-way.
+        
         Args:
             endpoint: Endpoint identifier
-            data_type: Expected data type identifier
+            data_type: Expected data type identifier, as a little-endian integer
             
         Returns:
             Raw response packet data
         """
         # Standard endpoint communication sequence
-        self._send_command(CMD_CLOSE_ENDPOINT, endpoint)
-        self._send_command(CMD_OPEN_ENDPOINT, endpoint)
+        self._open_endpoint(endpoint)
         self._send_command(CMD_READ)
         response = self._read_response(data_type)
-        self._send_command(CMD_CLOSE_ENDPOINT, endpoint)
+        self._close_endpoint(endpoint)
         
         return response
     
+    def _open_endpoint(self, endpoint: bytes) -> None:
+        """
+        Open an endpoint, closing it first if it may still be open.
+        
+        Args:
+            endpoint: Endpoint identifier
+        """
+        if endpoint in self._open_endpoints:
+            self._close_endpoint(endpoint)
+        
+        # Track before sending so a failed write still forces a close next time
+        self._open_endpoints.add(endpoint)
+        self._send_command(CMD_OPEN_ENDPOINT, endpoint)
+    
+    def _close_endpoint(self, endpoint: bytes) -> None:
+        """
+        Close an endpoint.
+        
+        Args:
+            endpoint: Endpoint identifier
+        """
+        self._send_command(CMD_CLOSE_ENDPOINT, endpoint)
+        self._open_endpoints.discard(endpoint)
+    
     def read_temperature(self) -> Optional[float]:
         """
         Read the liquid temperature from the device.
@@ -305,26 +465,21 @@ class CorsairLinkDevice:
             CorsairLinkError: If communication fails
         """
         try:
-            response = self._read_endpoint_data(ENDPOINT_TEMPS, DATA_TYPE_TEMPS)
-            
-            # Temperature data is at fixed positions (bytes 11-12)
-            if len(response) >= TEMP_VALUE_INDEX_HIGH + 1:
-                raw_temp = struct.unpack(
-                    '<h', 
-                    bytes([response[TEMP_VALUE_INDEX_LOW], response[TEMP_VALUE_INDEX_HIGH]])
-                )[0]
-                return raw_temp / TEMP_SCALING_FACTOR
-            
-            return None
+            response = self._read_endpoint_data(ENDPOINT_TEMPS, _DATA_TYPE_TEMPS_INT)
+            return self._parse_temperature(response)
             
         except Exception as e:
             self.logger.warning(f"Failed to read temperature: {e}")
             return None
     
-    def read_speeds(self) -> Tuple[Optional[int], List[Optional[int]]]:
+    def read_speeds(self, max_fans: Optional[int] = MAX_FANS) -> Tuple[Optional[int], List[Optional[int]]]:
         """
         Read pump and fan speeds from the device.
         
+        Args:
+            max_fans: Number of fan readings to return, or None for every
+                sensor the hub reports from the first fan sensor on
+        
         Returns:
             Tuple of (pump_rpm, [fan1_rpm, fan2_rpm, fan3_rpm])
             None values indicate unavailable sensors
@@ -333,67 +488,108 @@ class CorsairLinkDevice:
             CorsairLinkError: If communication fails
         """
         try:
-            response = self._read_endpoint_data(ENDPOINT_SPEEDS, DATA_TYPE_SPEEDS)
-            speeds = self._parse_speed_sensors(response)
-            
-            # Extract pump RPM
-            pump_rpm = None
-            if len(speeds) > PUMP_SENSOR_INDEX and speeds[PUMP_SENSOR_INDEX] is not None:
-                pump_rpm = speeds[PUMP_SENSOR_INDEX]
-            
-            # Extract fan RPMs
-            fan_rpms = []
-            for i in range(MAX_FANS):
-                fan_index = FAN_SENSORS_START_INDEX + i
-                if len(speeds) > fan_index and speeds[fan_index] is not None:
-                    fan_rpms.append(speeds[fan_index])
-                else:
-                    fan_rpms.append(None)
-            
-            return pump_rpm, fan_rpms
+            response = self._read_endpoint_data(ENDPOINT_SPEEDS, _DATA_TYPE_SPEEDS_INT)
+            return self._extract_speeds(self._parse_speed_sensors(response), max_fans)
             
         except Exception as e:
             self.logger.warning(f"Failed to read speeds: {e}")
-            return None, [None] * MAX_FANS
+            return None, [None] * (max_fans or 0)
     
-    def _parse_speed_sensors(self, packet: bytes) -> List[Optional[int]]:
+    def read_all(self, max_fans: Optional[int] = MAX_FANS
+                 ) -> Tuple[Optional[float], Optional[int], List[Optional[int]]]:
         """
-        Parse speed sensor data from a response packet.
+        Read temperature, pump and fan speeds from the device.
+        
+        The endpoints are read one after the other, each with its own
+        open/read/close sequence: the commands address a single handle, so
+        both endpoints cannot be open at once. A failure on one endpoint
+        does not discard the reading from the other.
         
         Args:
-            packet: Raw response packet
+            max_fans: Number of fan readings to return, or None for every
+                sensor the hub reports from the first fan sensor on
+        
+        Returns:
+            Tuple of (liquid_temp, pump_rpm, [fan1_rpm, fan2_rpm, fan3_rpm])
+            None values indicate unavailable sensors
+        """
+        liquid_temp = self.read_temperature()
+        pump_rpm, fan_rpms = self.read_speeds(max_fans)
+        return liquid_temp, pump_rpm, fan_rpms
+    
+    def _parse_temperature(self, packet: memoryview) -> float:
+        """
+        Parse the liquid temperature from a response packet.
+        
+        Args:
+            packet: Full-size response packet from _read_response
             
         Returns:
-            List of RPM values (None for unavailable sensors)
+            Temperature in Celsius
         """
-        if len(packet) <= PAYLOAD_START_INDEX:
-            return []
+        # Temperature data is at fixed positions (bytes 11-12)
+        raw_temp = _S16.unpack_from(packet, TEMP_VALUE_INDEX_LOW)[0]
+        return raw_temp / TEMP_SCALING_FACTOR
+    
+    def _extract_speeds(self, speeds: List[Optional[int]],
+                        max_fans: Optional[int] = MAX_FANS) -> Tuple[Optional[int], List[Optional[int]]]:
+        """
+        Pick the pump and fan RPMs out of the parsed speed sensors.
         
-        payload = packet[PAYLOAD_START_INDEX:]
-        if len(payload) < 1:
-            return []
+        Args:
+            speeds: Sensor values as returned by _parse_speed_sensors
+            max_fans: Number of fan readings to return, or None for every
+                sensor from FAN_SENSORS_START_INDEX on
+            
+        Returns:
+            Tuple of (pump_rpm, [fan1_rpm, fan2_rpm, fan3_rpm])
+        """
+        # Extract pump RPM
+        pump_rpm = None
+        if len(speeds) > PUMP_SENSOR_INDEX and speeds[PUMP_SENSOR_INDEX] is not None:
+            pump_rpm = speeds[PUMP_SENSOR_INDEX]
         
-        sensors = []
-        sensor_count = payload[0]
-        sensor_data_start = 1
+        # Extract fan RPMs
+        if max_fans is None:
+            max_fans = max(len(speeds) - FAN_SENSORS_START_INDEX, 0)
         
-        for i in range(sensor_count):
-            offset = sensor_data_start + (i * SENSOR_BLOCK_SIZE)
-            if offset + 2 >= len(payload):
-                break
-            
-            status = payload[offset]
-            if status == 0x00:  # Sensor available
-                rpm_value = struct.unpack('<h', payload[offset + 1:offset + 3])[0]
-                sensors.append(rpm_value)
+        fan_rpms = []
+        for i in range(max_fans):
+            fan_index = FAN_SENSORS_START_INDEX + i
+            if len(speeds) > fan_index and speeds[fan_index] is not None:
+                fan_rpms.append(speeds[fan_index])
             else:
-                sensors.append(None)
+                fan_rpms.append(None)
+        
+        return pump_rpm, fan_rpms
+    
+    def _parse_speed_sensors(self, packet: memoryview) -> List[Optional[int]]:
+        """
+        Parse speed sensor data from a response packet.
+        
+        Args:
+            packet: Full-size response packet from _read_response
+            
+        Returns:
+            List of RPM values (None for unavailable sensors)
+        """
+        sensor_data_start = PAYLOAD_START_INDEX + 1
+        sensor_count = min(packet[PAYLOAD_START_INDEX], MAX_SENSORS)
+        block = memoryview(packet)[
+            sensor_data_start:sensor_data_start + sensor_count * SENSOR_BLOCK_SIZE
+        ]
         
-        return sensors
+        # Status 0x00 means the sensor is available
+        return [rpm if status == 0x00 else None for status, rpm in _SENSOR.iter_unpack(block)]
 
 
 class TelemetryLogger:
-    """Handles CSV logging of telemetry data."""
+    """
+    Handles CSV logging of telemetry data.
+    
+    Rows are buffered and written when the buffer fills, at least every
+    CSV_FLUSH_INTERVAL_SECONDS, and on exit.
+    """
     
     def __init__(self, filename: str, device_path: str):
         """
@@ -407,10 +603,12 @@ class TelemetryLogger:
         self.device_path = device_path
         self.file = None
         self.writer = None
+        self._last_flush = time.monotonic()
     
     def __enter__(self):
         """Context manager entry."""
-        self.file = open(self.filename, 'w', newline='', encoding='utf-8')
+        self.file = open(self.filename, 'w', newline='', encoding='utf-8',
+                         buffering=CSV_BUFFER_SIZE)
         self.writer = csv.writer(self.file)
         
         # Write CSV header
@@ -422,8 +620,14 @@ class TelemetryLogger:
     def __exit__(self, exc_type, exc_val, exc_tb):
         """Context manager exit."""
         if self.file:
+            self.flush()
             self.file.close()
     
+    def flush(self) -> None:
+        """Write any buffered rows to disk."""
+        self.file.flush()
+        self._last_flush = time.monotonic()
+    
     def log_data(self, timestamp: str, liquid_temp: Optional[float], 
                  pump_rpm: Optional[int], fan_rpms: List[Optional[int]]) -> None:
         """
@@ -437,6 +641,29 @@ class TelemetryLogger:
         """
         row = [timestamp, self.device_path, liquid_temp, pump_rpm] + fan_rpms
         self.writer.writerow(row)
+        
+        if time.monotonic() - self._last_flush >= CSV_FLUSH_INTERVAL_SECONDS:
+            self.flush()
+
+
+@functools.lru_cache(maxsize=1)
+def _format_seconds(seconds: int) -> str:
+    """Format whole epoch seconds as local time; cached while the second is unchanged."""
+    return time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(seconds))
+
+
+def format_timestamp(t: float) -> str:
+    """
+    Format a time.time() value as a local ISO 8601 timestamp.
+    
+    Args:
+        t: Seconds since the epoch
+        
+    Returns:
+        Timestamp with microsecond precision, e.g. 2025-06-11T14:03:27.123456
+    """
+    seconds = int(t)
+    return f'{_format_seconds(seconds)}.{int((t - seconds) * 1e6):06d}'
 
 
 def format_telemetry_output(timestamp: str, liquid_temp: Optional[float],
@@ -501,6 +728,11 @@ Notes:
     return parser
 
 
+def handle_sigterm(signum, frame) -> None:
+    """Treat SIGTERM like Ctrl+C so buffered CSV rows are flushed on shutdown."""
+    raise KeyboardInterrupt
+
+
 def main() -> None:
     """Main application entry point."""
     parser = create_argument_parser()
@@ -511,6 +743,8 @@ def main() -> None:
         print("Error: Interval must be positive")
         sys.exit(1)
     
+    signal.signal(signal.SIGTERM, handle_sigterm)
+    
     try:
         # Connect to device
         with CorsairLinkDevice(debug=args.debug) as device:
@@ -526,11 +760,10 @@ def main() -> None:
             
             with logger_context if logger_context else suppress_context():
                 while True:
-                    timestamp = datetime.now().isoformat()
+                    timestamp = format_timestamp(time.time())
                     
                     # Read telemetry data
-                    liquid_temp = device.read_temperature()
-                    pump_rpm, fan_rpms = device.read_speeds()
+                    liquid_temp, pump_rpm, fan_rpms = device.read_all()
                     
                     # Output data
                     if logger_context: